@@ -1,3 +1,5 @@
+import time
+import queue
 import threading
 import logging
 from pathlib import Path
@@ -6,11 +8,27 @@ from typing import Optional
 import customtkinter as ctk
 from tkinter import filedialog, messagebox, scrolledtext
 
-from selenium_automation import SeleniumAutomation, setup_logging
+import config
+from selenium_automation import (
+    SeleniumAutomation,
+    HttpAutomation,
+    calcular_processos,
+    setup_logging,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Intervalo de atualização do log (ms) e máximo de mensagens por atualização
+LOG_POLL_MS = 100
+LOG_BATCH_SIZE = 500
+
+# Máximo de linhas mantidas no log; as mais antigas são descartadas
+LOG_MAX_LINES = 5000
+
+# Intervalo mínimo entre atualizações da barra de progresso (s)
+PROGRESS_MIN_INTERVAL = 0.1
+
 
 class AutomationGUI(ctk.CTk):
     """GUI principal para a automação."""
@@ -30,14 +48,68 @@ class AutomationGUI(ctk.CTk):
         
         # Variáveis
         self.file_path: Optional[str] = None
-        self.automation: Optional[SeleniumAutomation] = None
+        self.automation = None
         self.is_running = False
+        self._log_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._last_progress_ui = 0.0
+        self._progress_lock = threading.Lock()
+        self._progress_latest: Optional[tuple] = None
+        self._progress_scheduled = False
+        self._prewarmed: Optional[SeleniumAutomation] = None
+        self._prewarm_lock = threading.Lock()
+        self._prewarm_thread: Optional[threading.Thread] = None
+        self._closing = False
         
         # Setup logging
-        setup_logging()
+        setup_logging(config.LOG_FILE)
         
         # Criar interface
         self._create_widgets()
+        
+        # Drena o log periodicamente na thread da interface
+        self.after(LOG_POLL_MS, self._drain_log_queue)
+        
+        # Abre o navegador enquanto o usuário escolhe a planilha. Só vale a
+        # pena sem o pool de processos, que abre um navegador por worker:
+        # exige SELENIUM_WORKERS = 1 (ou uma máquina de um núcleo)
+        if (
+            config.AUTOMATION_BACKEND == "selenium"
+            and calcular_processos(config.SELENIUM_WORKERS) == 1
+        ):
+            self._prewarm_thread = threading.Thread(target=self._prewarm_driver, daemon=True)
+            self._prewarm_thread.start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+    
+    def _prewarm_driver(self) -> None:
+        """Cria e posiciona no site uma automação Selenium para o próximo início."""
+        automation = SeleniumAutomation(
+            headless=False,
+            progress_callback=self._update_progress
+        )
+        try:
+            automation.navigate()
+        except Exception as e:
+            logger.warning("Falha ao pré-carregar o navegador: %s", e)
+            # O Chrome pode ter aberto antes da falha; fechá-lo libera o perfil
+            automation.fechar()
+            return
+        
+        with self._prewarm_lock:
+            if not self._closing:
+                self._prewarmed = automation
+                return
+        
+        # A janela fechou enquanto o navegador abria
+        automation.fechar()
+    
+    def _on_close(self) -> None:
+        """Fecha o navegador pré-carregado, se não foi usado, e a janela."""
+        with self._prewarm_lock:
+            self._closing = True
+            automation, self._prewarmed = self._prewarmed, None
+        if automation is not None:
+            automation.fechar()
+        self.destroy()
     
     def _create_widgets(self) -> None:
         """Cria todos os widgets da interface."""
@@ -278,14 +350,15 @@ class AutomationGUI(ctk.CTk):
         try:
             self._log("🚀 Iniciando automação...", "info")
             
-            automation = SeleniumAutomation(
-                headless=False,
-                progress_callback=self._update_progress
-            )
+            automation = self._criar_automacao()
             self.automation = automation
             
             try:
                 stats = automation.processar_planilha(self.file_path)
+                # Linhas finais vazias, já no checkpoint ou fora de ordem podem
+                # não ter reportado current == total
+                if self.is_running:
+                    self.after(0, self._finish_progress, stats["total"])
                 
                 # Log dos resultados
                 self._log("\n" + "="*50, "info")
@@ -294,6 +367,8 @@ class AutomationGUI(ctk.CTk):
                 self._log(f"Total processado: {stats['total']}", "info")
                 self._log(f"✓ Sucessos: {stats['sucesso']}", "success")
                 self._log(f"✗ Erros: {stats['erro']}", "error" if stats['erro'] > 0 else "success")
+                if stats['nao_confirmado']:
+                    self._log(f"⚠ Sem confirmação: {stats['nao_confirmado']}", "warning")
                 
                 if stats['erros_detalhados']:
                     self._log("\n📋 Detalhes dos erros:", "warning")
@@ -303,13 +378,23 @@ class AutomationGUI(ctk.CTk):
                             "error"
                         )
                 
-                messagebox.showinfo(
-                    "Sucesso",
+                if stats['nao_confirmados_detalhados']:
+                    self._log("\n📋 Enviados sem confirmação (confira no site):", "warning")
+                    for erro in stats['nao_confirmados_detalhados']:
+                        self._log(
+                            f"  Linha {erro['linha']}: {erro['produto']}",
+                            "warning"
+                        )
+                
+                summary = (
                     f"Automação concluída!\n\n"
                     f"Processados: {stats['total']}\n"
                     f"Sucessos: {stats['sucesso']}\n"
-                    f"Erros: {stats['erro']}"
+                    f"Erros: {stats['erro']}\n"
+                    f"Sem confirmação: {stats['nao_confirmado']}"
                 )
+                # Diálogos e widgets só podem ser tocados na thread do Tk
+                self.after(0, lambda: messagebox.showinfo("Sucesso", summary))
             
             finally:
                 automation.fechar()
@@ -318,12 +403,38 @@ class AutomationGUI(ctk.CTk):
         except Exception as e:
             error_msg = f"Erro durante automação: {str(e)}"
             self._log(error_msg, "error")
-            messagebox.showerror("Erro", error_msg)
+            self.after(0, lambda: messagebox.showerror("Erro", error_msg))
             logger.exception(e)
         
         finally:
             self.is_running = False
-            self._update_ui_running(False)
+            self.after(0, self._update_ui_running, False)
+    
+    def _criar_automacao(self):
+        """Cria a automação conforme o backend configurado."""
+        if config.AUTOMATION_BACKEND == "http":
+            return HttpAutomation(progress_callback=self._update_progress)
+        
+        if config.AUTOMATION_BACKEND == "playwright":
+            from playwright_automation import PlaywrightAutomation
+            
+            return PlaywrightAutomation(
+                headless=False,
+                progress_callback=self._update_progress
+            )
+        
+        # Aguarda o pré-carregamento em andamento (o perfil do Chrome é exclusivo)
+        if self._prewarm_thread is not None:
+            self._prewarm_thread.join()
+        with self._prewarm_lock:
+            automation, self._prewarmed = self._prewarmed, None
+        if automation is not None:
+            return automation
+        
+        return SeleniumAutomation(
+            headless=False,
+            progress_callback=self._update_progress
+        )
     
     def _stop_automation(self) -> None:
         """Para a automação."""
@@ -340,23 +451,81 @@ class AutomationGUI(ctk.CTk):
         current: int = 0,
         total: int = 0
     ) -> None:
-        """Atualiza a barra de progresso."""
+        """Registra o progresso (chamado pela thread da automação)."""
         self._log(message, "info")
         
+        if total <= 0:
+            return
+        
+        # Limita o redesenho a ~10 Hz: guarda sempre o estado mais recente e
+        # agenda no máximo um redesenho pendente, que exibirá esse estado
+        with self._progress_lock:
+            if self._progress_latest is not None:
+                # Com processos em paralelo os índices chegam fora de ordem
+                current = max(current, self._progress_latest[1])
+            self._progress_latest = (message, current, total)
+            if self._progress_scheduled:
+                return
+            self._progress_scheduled = True
+            delay = PROGRESS_MIN_INTERVAL - (time.monotonic() - self._last_progress_ui)
+        
+        self.after(max(0, int(delay * 1000)), self._render_progress)
+    
+    def _render_progress(self) -> None:
+        """Exibe o progresso mais recente na thread do Tk."""
+        with self._progress_lock:
+            self._progress_scheduled = False
+            self._last_progress_ui = time.monotonic()
+            if self._progress_latest is None:
+                return
+            message, current, total = self._progress_latest
+        
+        self._draw_progress(message, current, total)
+    
+    def _finish_progress(self, total: int) -> None:
+        """Leva a barra a 100% ao fim de uma execução completa."""
+        with self._progress_lock:
+            self._progress_latest = None
         if total > 0:
-            progress = current / total
-            self.progress_bar.set(progress)
-            self.progress_info.configure(text=f"{current} / {total} processados")
-            self.status_label.configure(text=message)
-            
-            if current > 0:
-                self.stats_label.configure(text=f"{progress*100:.1f}%")
+            self._draw_progress("Processamento concluído", total, total)
+    
+    def _draw_progress(self, message: str, current: int, total: int) -> None:
+        """Atualiza os widgets de progresso."""
+        progress = current / total
+        self.progress_bar.set(progress)
+        self.progress_info.configure(text=f"{current} / {total} processados")
+        self.status_label.configure(text=message)
+        
+        if current > 0:
+            self.stats_label.configure(text=f"{progress*100:.1f}%")
     
     def _log(self, message: str, tag: str = "info") -> None:
-        """Adiciona mensagem ao log."""
-        self.log_text.insert("end", message + "\n", tag)
-        self.log_text.see("end")
-        self.update()
+        """Enfileira mensagem para o log (seguro a partir de qualquer thread)."""
+        self._log_queue.put((message, tag))
+    
+    def _drain_log_queue(self) -> None:
+        """Insere as mensagens pendentes no log, agrupadas por tag."""
+        batch = []
+        try:
+            for _ in range(LOG_BATCH_SIZE):
+                message, tag = self._log_queue.get_nowait()
+                if batch and batch[-1][1] == tag:
+                    batch[-1][0].append(message)
+                else:
+                    batch.append(([message], tag))
+        except queue.Empty:
+            pass
+        
+        if batch:
+            for messages, tag in batch:
+                self.log_text.insert("end", "\n".join(messages) + "\n", tag)
+            
+            lines = int(self.log_text.index("end-1c").split(".")[0])
+            if lines > LOG_MAX_LINES:
+                self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
+            self.log_text.see("end")
+        
+        self.after(LOG_POLL_MS, self._drain_log_queue)
     
     def _clear_log(self) -> None:
         """Limpa o log."""
@@ -370,6 +539,8 @@ class AutomationGUI(ctk.CTk):
             self.btn_stop.configure(state="normal")
             self.file_path_label.configure(state="disabled")
             self.progress_bar.set(0)
+            with self._progress_lock:
+                self._progress_latest = None
             self._log("\n🔄 Automação iniciada...", "info")
         else:
             self.btn_start.configure(state="normal")
@@ -0,0 +1,488 @@
+"""
+Base comum aos backends de automação do Sistema de Contabilidade.
+Leitura e validação da planilha, checkpoint das linhas enviadas e o
+registro dos resultados de cada linha.
+"""
+
+import json
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Optional, List, Dict, Any, Iterable, Iterator, Set, Tuple
+from dataclasses import dataclass
+
+import pandas as pd
+import config
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Product:
+    """Classe para representar um produto."""
+    cliente: str
+    produto: str
+    quantidade: int
+    categoria: str
+
+
+class SalvamentoNaoConfirmado(Exception):
+    """
+    O produto foi enviado (botão salvar clicado), mas o site não confirmou
+    o salvamento a tempo. Não é reenviado ao retomar, para não duplicar.
+    """
+
+
+# Função JavaScript (page.evaluate / execute_async_script) que clica no botão
+# salvar e resolve com o resultado do salvamento:
+#   "salvo": a página reagiu ao clique (requisição disparada por ele concluída,
+#            formulário limpo ou recriado, mais elementos casando com
+#            `confirmacao` ou, sem seletor, mudança no DOM fora do formulário)
+#            e não há requisição do clique pendente;
+#   "falha": uma requisição disparada pelo clique falhou;
+#   "sem_confirmacao": nada disso em `limite` milissegundos.
+# `primeiro` é o primeiro campo do formulário, já preenchido.
+JS_CONFIRMAR_SALVAMENTO = """
+({botao, primeiro, confirmacao, limite}) => new Promise(resolve => {
+    // Acompanha fetch/XHR da página; instalado uma vez por carregamento
+    const rede = window.__automacaoRede || (window.__automacaoRede = (() => {
+        const estado = {iniciadas: 0, pendentes: new Set(), concluida: 0, falha: 0};
+        const inicio = () => {
+            const id = ++estado.iniciadas;
+            estado.pendentes.add(id);
+            return id;
+        };
+        const fim = (id, ok) => {
+            estado.pendentes.delete(id);
+            estado.concluida = Math.max(estado.concluida, id);
+            if (!ok) estado.falha = Math.max(estado.falha, id);
+        };
+        const fetchOriginal = window.fetch;
+        if (fetchOriginal) {
+            window.fetch = function () {
+                const id = inicio();
+                return fetchOriginal.apply(this, arguments).then(
+                    resposta => { fim(id, resposta.ok); return resposta; },
+                    erro => { fim(id, false); throw erro; }
+                );
+            };
+        }
+        const enviar = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            const id = inicio();
+            this.addEventListener("loadend", () => fim(id, this.status >= 200 && this.status < 400));
+            return enviar.apply(this, arguments);
+        };
+        return estado;
+    })());
+    
+    const enviado = primeiro.value;
+    const formulario = primeiro.closest("form") || primeiro.parentElement;
+    const contar = () => confirmacao ? document.querySelectorAll(confirmacao).length : 0;
+    
+    // Um ciclo de espera: o que a página renderizar pelo preenchimento não
+    // conta como reação ao clique
+    setTimeout(() => {
+        let mudou = false;
+        const observador = new MutationObserver(mutacoes => {
+            mudou = mudou || mutacoes.some(m => !formulario.contains(m.target));
+        });
+        observador.observe(document.body, {childList: true, subtree: true, characterData: true});
+        
+        const antes = contar(), ultimaAntes = rede.iniciadas, prazo = Date.now() + limite;
+        const concluir = (status) => {
+            observador.disconnect();
+            resolve(status);
+        };
+        botao.click();
+        
+        (function aguardar() {
+            const pendente = [...rede.pendentes].some(id => id > ultimaAntes);
+            const reagiu = rede.concluida > ultimaAntes
+                || !primeiro.isConnected
+                || primeiro.value !== enviado
+                || (confirmacao ? contar() > antes : mudou);
+            if (rede.falha > ultimaAntes) {
+                concluir("falha");
+            } else if (reagiu && !pendente) {
+                concluir("salvo");
+            } else if (Date.now() > prazo) {
+                concluir("sem_confirmacao");
+            } else {
+                setTimeout(aguardar, 50);
+            }
+        })();
+    }, 0);
+})
+"""
+
+
+def checar_salvamento(status: str) -> None:
+    """
+    Converte o resultado de JS_CONFIRMAR_SALVAMENTO em exceção.
+    
+    Raises:
+        RuntimeError: Se a requisição de salvamento falhou
+        SalvamentoNaoConfirmado: Se o site não confirmou a tempo
+    """
+    if status == "falha":
+        raise RuntimeError("O site recusou o salvamento")
+    if status == "sem_confirmacao":
+        raise SalvamentoNaoConfirmado(
+            f"Salvamento enviado sem confirmação em {config.ELEMENT_TIMEOUT}s; "
+            f"confira no site antes de reenviar"
+        )
+
+
+# Colunas esperadas na planilha, na ordem em que aparecem
+COLUNAS_PLANILHA = ["cliente", "produto", "quantidade", "categoria"]
+
+
+class Checkpoint:
+    """
+    Registro das linhas já enviadas com sucesso, em `<planilha>.ckpt`.
+    
+    Permite retomar o processamento após uma falha sem reenviar produtos.
+    Cada linha é registrada pelo índice e por um hash do seu conteúdo: a
+    planilha pode ser editada e salva entre as execuções (por exemplo, para
+    corrigir as linhas com erro) sem perder o que já foi enviado, e uma linha
+    cujo conteúdo mudou volta a ser enviada. Cada marcação vai ao disco na
+    hora, para sobreviver ao processo ser morto.
+    """
+    
+    def __init__(self, filepath: str):
+        self.path = Path(filepath).with_suffix(".ckpt")
+        self.concluidas = self._carregar()
+        self._file = None
+    
+    @staticmethod
+    def chave(row: tuple) -> str:
+        """Hash do conteúdo da linha, como lido por ler_linhas."""
+        conteudo = json.dumps(
+            list(row[:len(COLUNAS_PLANILHA)]), ensure_ascii=False, default=str
+        )
+        return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()[:16]
+    
+    def _carregar(self) -> Set[Tuple[int, str]]:
+        """Lê os pares (índice, hash) já concluídos, ignorando linhas corrompidas."""
+        if not self.path.exists():
+            return set()
+        concluidas = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                partes = line.split()
+                if len(partes) == 2 and partes[0].isdigit():
+                    concluidas.add((int(partes[0]), partes[1]))
+        return concluidas
+    
+    def preparar(self, total: int) -> None:
+        """
+        Descarta registros de linhas fora da planilha atual e, se não houver
+        nada a retomar, recomeça o arquivo vazio.
+        
+        Deve ser chamado uma única vez, antes de os workers começarem a marcar.
+        """
+        self.concluidas = {
+            (index, chave) for index, chave in self.concluidas if index <= total
+        }
+        if not self.concluidas:
+            self.path.write_text("", encoding="utf-8")
+    
+    def pendentes(self, rows: Iterable[tuple]) -> Iterator[Tuple[int, tuple]]:
+        """Numera as linhas a partir de 1 e omite as já concluídas sem alteração."""
+        for index, row in enumerate(rows, 1):
+            if (index, self.chave(row)) not in self.concluidas:
+                yield index, row
+    
+    def marcar(self, index: int, row: tuple) -> None:
+        """Registra a linha como enviada com sucesso."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(f"{index} {self.chave(row)}\n")
+        self._file.flush()
+    
+    def fechar(self) -> None:
+        """Fecha o arquivo do checkpoint."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def remover(self) -> None:
+        """Apaga o checkpoint (planilha concluída sem erros)."""
+        self.fechar()
+        self.path.unlink(missing_ok=True)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.fechar()
+
+
+def novas_estatisticas() -> Dict[str, Any]:
+    """Cria o dicionário de estatísticas vazio."""
+    return {
+        "total": 0,
+        "sucesso": 0,
+        "erro": 0,
+        "nao_confirmado": 0,
+        "erros_detalhados": [],
+        "nao_confirmados_detalhados": []
+    }
+
+
+def ler_linhas(filepath: str) -> Tuple[int, Iterator[tuple]]:
+    """
+    Lê a planilha de uma vez e normaliza as colunas de forma vetorizada.
+    
+    Os textos já saem sem espaços nas bordas, a quantidade convertida para
+    número e as células vazias como None. Um texto só com espaços vira ""
+    (não None), para que criar_produto o reporte como campo vazio.
+    
+    Returns:
+        Tupla (total de linhas de dados, iterador das linhas sem o cabeçalho)
+    """
+    df = pd.read_excel(
+        filepath,
+        engine="calamine",
+        usecols=list(range(len(COLUNAS_PLANILHA))),
+        names=COLUNAS_PLANILHA,
+        dtype=object,
+    )
+    
+    for coluna in ("cliente", "produto", "categoria"):
+        df[coluna] = df[coluna].astype("string").str.strip()
+    
+    quantidade = pd.to_numeric(df["quantidade"], errors="coerce")
+    # Valores não numéricos são mantidos para que criar_produto reporte o erro
+    df["quantidade"] = quantidade.where(quantidade.notna(), df["quantidade"])
+    
+    df = df.astype(object).where(df.notna(), None)
+    return len(df), df.itertuples(index=False, name=None)
+
+
+def criar_produto(row: tuple) -> Product:
+    """
+    Valida uma linha já normalizada por ler_linhas e cria o Product.
+    
+    Raises:
+        ValueError: Se algum campo obrigatório estiver vazio ou inválido
+    """
+    cliente, produto, quantidade, categoria = row[:4]
+    
+    # Validação básica (sem montar lista a cada linha)
+    if not cliente or not produto or not quantidade or not categoria:
+        raise ValueError("Campos obrigatórios vazios")
+    
+    try:
+        quantidade = int(quantidade)
+    except (TypeError, ValueError):
+        raise ValueError(f"Quantidade inválida: {quantidade}") from None
+    
+    product = Product(
+        cliente=cliente,
+        produto=produto,
+        quantidade=quantidade,
+        categoria=categoria
+    )
+    
+    # Rejeita aqui, sem gastar uma ida ao navegador
+    if product.categoria not in config.VALID_CATEGORIES:
+        raise ValueError(f"Categoria inválida: {product.categoria}")
+    
+    return product
+
+
+class BaseAutomation(ABC):
+    """
+    Comportamento comum aos backends de automação: progresso, registro do
+    resultado de cada linha e fechamento do processamento.
+    
+    As subclasses definem `progress_callback`, `_parar`,
+    `processar_planilha()` e `fechar()`.
+    """
+    
+    progress_callback: Optional[Callable] = None
+    _parar: bool = False
+    
+    def _report_progress(self, message: str, current: int = 0, total: int = 0) -> None:
+        """Reporta progresso via callback."""
+        if self.progress_callback:
+            self.progress_callback(message, current, total)
+        if total > 0:
+            logger.info("%s (%d/%d)", message, current, total)
+        else:
+            logger.info("%s", message)
+    
+    def _preparar_linha(self, index: int, row: tuple, total: int) -> Optional[Product]:
+        """
+        Valida a linha e reporta o início do seu processamento.
+        
+        Returns:
+            O Product da linha, ou None se a linha estiver vazia
+            
+        Raises:
+            ValueError: Se a linha for inválida (ver criar_produto)
+        """
+        # Pula linhas vazias. Só a célula realmente vazia (None) conta: um
+        # cliente só com espaços sai de ler_linhas como "" e é reportado
+        if not row or row[0] is None:
+            return None
+        
+        product = criar_produto(row)
+        self._report_progress(
+            f"Processando: {product.cliente} - {product.produto}",
+            index,
+            total
+        )
+        return product
+    
+    def _registrar_envio(
+        self,
+        stats: Dict[str, Any],
+        index: int,
+        row: tuple,
+        product: Product,
+        sucesso: bool,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> None:
+        """Contabiliza o resultado do envio de um produto."""
+        if sucesso:
+            stats["sucesso"] += 1
+            if checkpoint is not None:
+                checkpoint.marcar(index, row)
+        else:
+            stats["erro"] += 1
+            stats["erros_detalhados"].append({
+                "linha": index + 1,
+                "produto": product.produto,
+                "erro": "Falha ao submeter"
+            })
+    
+    def _registrar_erro(
+        self,
+        stats: Dict[str, Any],
+        index: int,
+        row: tuple,
+        erro: Exception
+    ) -> None:
+        """Contabiliza uma linha que falhou antes ou durante o envio."""
+        stats["erro"] += 1
+        stats["erros_detalhados"].append({
+            "linha": index + 1,
+            "produto": row[1] if len(row) > 1 else "Desconhecido",
+            "erro": str(erro)
+        })
+        logger.error("Erro na linha %d: %s", index + 1, erro)
+    
+    def _registrar_nao_confirmado(
+        self,
+        stats: Dict[str, Any],
+        index: int,
+        row: tuple,
+        product: Product,
+        erro: SalvamentoNaoConfirmado,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> None:
+        """
+        Contabiliza um produto enviado sem confirmação do site.
+        
+        Fica no checkpoint como enviado: reenviá-lo poderia duplicar o
+        produto. O usuário confere essas linhas no site.
+        """
+        stats["nao_confirmado"] += 1
+        stats["nao_confirmados_detalhados"].append({
+            "linha": index + 1,
+            "produto": product.produto,
+            "erro": str(erro)
+        })
+        if checkpoint is not None:
+            checkpoint.marcar(index, row)
+        logger.warning("Linha %d enviada sem confirmação: %s", index + 1, erro)
+    
+    def _registrar_falha_worker(
+        self,
+        stats: Dict[str, Any],
+        worker: str,
+        erro: Exception
+    ) -> None:
+        """
+        Contabiliza um worker que não conseguiu processar suas linhas.
+        
+        Conta como erro para que o checkpoint seja mantido.
+        """
+        stats["erro"] += 1
+        stats["erros_detalhados"].append({
+            "linha": 0,
+            "produto": f"FALHA NO WORKER {worker}",
+            "erro": str(erro)
+        })
+        logger.error("Falha no worker %s: %s", worker, erro)
+    
+    def _registrar_erro_critico(self, stats: Dict[str, Any], erro: Exception) -> None:
+        """Registra um erro que interrompeu o processamento da planilha."""
+        logger.error("Erro crítico ao processar planilha: %s", erro)
+        stats["erros_detalhados"].append({
+            "linha": 0,
+            "produto": "ERRO CRÍTICO",
+            "erro": str(erro)
+        })
+    
+    def _retomar(
+        self,
+        filepath: str,
+        stats: Dict[str, Any],
+        rows: Iterable[tuple]
+    ) -> Tuple[Checkpoint, List[Tuple[int, tuple]]]:
+        """
+        Abre o checkpoint da planilha e separa as linhas ainda pendentes.
+        
+        As linhas enviadas em uma execução anterior, e não alteradas desde
+        então, contam como sucesso.
+        
+        Returns:
+            Tupla (checkpoint, pares (índice, linha) pendentes)
+        """
+        checkpoint = Checkpoint(filepath)
+        checkpoint.preparar(stats["total"])
+        pendentes = list(checkpoint.pendentes(rows))
+        
+        puladas = stats["total"] - len(pendentes)
+        if puladas:
+            self._report_progress(f"Retomando: {puladas} linhas já enviadas serão puladas")
+            stats["sucesso"] += puladas
+        
+        return checkpoint, pendentes
+    
+    def _concluir(self, stats: Dict[str, Any], checkpoint: Checkpoint) -> None:
+        """Ordena os erros, descarta o checkpoint se tudo foi enviado e reporta."""
+        stats["erros_detalhados"].sort(key=lambda erro: erro["linha"])
+        stats["nao_confirmados_detalhados"].sort(key=lambda erro: erro["linha"])
+        
+        if stats["erro"] == 0 and not self._parar:
+            checkpoint.remover()
+        
+        self._report_progress(
+            f"Processamento concluído: {stats['sucesso']} sucesso, {stats['erro']} erros, "
+            f"{stats['nao_confirmado']} sem confirmação"
+        )
+    
+    @abstractmethod
+    def processar_planilha(self, filepath: str) -> Dict[str, Any]:
+        """Processa a planilha e devolve as estatísticas do processamento."""
+    
+    @abstractmethod
+    def fechar(self) -> None:
+        """Encerra a automação."""
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.fechar()
@@ -2,23 +2,43 @@
 Configurações da aplicação.
 """
 
+from pathlib import Path
+
 # URL do site a automatizar
 SITE_URL = "https://devaprender-contabil.netlify.app/"
 
 # Modo headless (True = sem interface do navegador)
 HEADLESS_MODE = False
 
-# Timeout para esperar elementos (segundos)
-ELEMENT_TIMEOUT = 10
+# Perfis persistentes do Chrome (um subdiretório por processo)
+CHROME_PROFILE_DIR = Path.home() / ".cache" / "automation_chrome"
+
+# Backend de automação: "selenium" (processos Chrome), "playwright"
+# (contextos assíncronos) ou "http" (POST direto em API_URL)
+AUTOMATION_BACKEND = "selenium"
+
+# Endpoint chamado pelo botão salvar (capturado na aba Network do DevTools).
+# Obrigatório para o backend "http"; no backend "selenium", faz o envio por
+# fetch dentro da página em vez de preencher o formulário.
+API_URL = None
 
-# Delay entre ações (segundos)
-ACTION_DELAY = 0.5
+# Máximo de requisições simultâneas no backend "http"
+HTTP_CONCURRENCY = 20
 
-# Delay entre preenchimentos (segundos)
-FILL_DELAY = 0.3
+# Timeout de cada requisição no backend "http" (segundos)
+HTTP_TIMEOUT = 30
 
-# Delay após submit (segundos)
-SUBMIT_DELAY = 1.0
+# Máximo de processos Chrome simultâneos no backend Selenium. Com 1, não há
+# pool de processos e a interface já abre o navegador no site enquanto a
+# planilha é escolhida (pré-carregamento); com mais de 1, cada processo abre
+# o seu Chrome só quando o processamento começa.
+SELENIUM_WORKERS = 8
+
+# Número de contextos simultâneos no backend Playwright
+PLAYWRIGHT_WORKERS = 8
+
+# Timeout para esperar elementos (segundos)
+ELEMENT_TIMEOUT = 10
 
 # Arquivo de log
 LOG_FILE = "automacao.log"
@@ -45,8 +65,15 @@ FORM_FIELDS = {
     "categoria": "categoria"
 }
 
+# Seletor CSS de elementos que aumentam a cada salvamento (ex.: linhas da
+# tabela de produtos). Opcional: o salvamento também é confirmado quando a
+# requisição disparada pelo botão salvar termina ou quando o formulário é
+# limpo ou recriado; sem seletor, vale ainda qualquer mudança na página fora
+# do formulário. Sem confirmação em ELEMENT_TIMEOUT, a linha é reportada como
+# "sem confirmação" (não como erro) e não é reenviada ao retomar.
+SAVE_CONFIRMATION_SELECTOR = None
+
 # Botões
 BUTTONS = {
-    "save": "button.btn-save",
-    "clear": "button.btn-clear"
+    "save": "button.btn-save"
 }
@@ -0,0 +1,218 @@
+"""
+Módulo de automação Playwright (assíncrono) para o Sistema de Contabilidade.
+Preenche vários produtos em paralelo, cada worker com seu próprio BrowserContext.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional, Dict, Any, Iterator, Tuple
+
+import config
+from playwright.async_api import async_playwright, Browser, Page
+
+from base_automation import (
+    JS_CONFIRMAR_SALVAMENTO,
+    BaseAutomation,
+    Checkpoint,
+    Product,
+    SalvamentoNaoConfirmado,
+    checar_salvamento,
+    ler_linhas,
+    novas_estatisticas,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class PlaywrightAutomation(BaseAutomation):
+    """Automação de preenchimento de formulários com contextos concorrentes."""
+
+    def __init__(
+        self,
+        url: str = "https://devaprender-contabil.netlify.app/",
+        headless: bool = config.HEADLESS_MODE,
+        progress_callback: Optional[Callable] = None,
+        workers: int = config.PLAYWRIGHT_WORKERS,
+    ):
+        """
+        Inicializa a automação Playwright.
+
+        Args:
+            url: URL do site a automatizar
+            headless: Se True, executa o navegador em modo headless
+            progress_callback: Função para reportar progresso
+            workers: Número de contextos processando produtos em paralelo
+        """
+        self.url = url or config.SITE_URL
+        self.headless = headless
+        self.progress_callback = progress_callback
+        self.workers = max(1, workers)
+        self._parar = False
+
+    async def _nova_pagina(self, browser: Browser) -> Page:
+        """Cria um contexto isolado e abre o formulário nele."""
+        context = await browser.new_context()
+        page = await context.new_page()
+        page.set_default_timeout(config.ELEMENT_TIMEOUT * 1000)
+        await page.goto(self.url)
+        await page.wait_for_selector(f"#{config.FORM_FIELDS['cliente']}")
+        return page
+
+    async def _fill_campo_texto(self, page: Page, field_id: str, value: str) -> None:
+        """Preenche um campo de texto."""
+        try:
+            await page.fill(f"#{field_id}", str(value))
+        except Exception as e:
+            logger.error("Erro ao preencher campo %s: %s", field_id, e)
+            raise
+
+    async def _select_categoria(self, page: Page, categoria: str) -> None:
+        """Seleciona uma categoria no dropdown."""
+        try:
+            await page.select_option(f"#{config.FORM_FIELDS['categoria']}", categoria)
+        except Exception as e:
+            logger.error("Erro ao selecionar categoria %s: %s", categoria, e)
+            raise
+
+    async def _submit_form(self, page: Page) -> None:
+        """
+        Submete o formulário e aguarda a confirmação do salvamento, para que
+        o próximo produto não seja preenchido com o envio ainda em curso.
+
+        Raises:
+            RuntimeError: Se a requisição de salvamento falhar
+            SalvamentoNaoConfirmado: Se o site não confirmar a tempo
+        """
+        try:
+            status = await page.evaluate(JS_CONFIRMAR_SALVAMENTO, {
+                "botao": await page.locator(config.BUTTONS["save"]).element_handle(),
+                "primeiro": await page.locator(
+                    f"#{config.FORM_FIELDS['cliente']}"
+                ).element_handle(),
+                "confirmacao": config.SAVE_CONFIRMATION_SELECTOR,
+                "limite": config.ELEMENT_TIMEOUT * 1000,
+            })
+        except Exception as e:
+            logger.error("Erro ao submeter formulário: %s", e)
+            raise
+        checar_salvamento(status)
+
+    async def preencher_produto(self, page: Page, product: Product) -> bool:
+        """
+        Preenche e submete um produto na página informada.
+
+        Args:
+            page: Página (de um contexto exclusivo do worker) com o formulário
+            product: Objeto Product com dados a preencher
+
+        Returns:
+            True se sucesso, False caso contrário
+
+        Raises:
+            SalvamentoNaoConfirmado: Se o produto foi enviado sem confirmação
+        """
+        try:
+            await self._fill_campo_texto(page, config.FORM_FIELDS["cliente"], product.cliente)
+            await self._fill_campo_texto(page, config.FORM_FIELDS["produto"], product.produto)
+            await self._fill_campo_texto(page, config.FORM_FIELDS["quantidade"], product.quantidade)
+            await self._select_categoria(page, product.categoria)
+            await self._submit_form(page)
+            return True
+        except SalvamentoNaoConfirmado:
+            raise
+        except Exception as e:
+            logger.error("Erro ao preencher produto %s: %s", product.produto, e)
+            return False
+
+    async def _worker(
+        self,
+        browser: Browser,
+        rows: Iterator[Tuple[int, tuple]],
+        stats: Dict[str, Any],
+        checkpoint: Checkpoint,
+        worker_id: int,
+    ) -> None:
+        """
+        Consome linhas do iterador compartilhado usando um contexto próprio.
+
+        Se o contexto não abrir, a falha é registrada e as linhas ficam para
+        os demais workers.
+        """
+        try:
+            page = await self._nova_pagina(browser)
+        except Exception as e:
+            self._registrar_falha_worker(stats, f"contexto-{worker_id}", e)
+            return
+
+        try:
+            # O iterador é compartilhado: cada linha é entregue a um único worker
+            for index, row in rows:
+                if self._parar:
+                    break
+
+                try:
+                    product = self._preparar_linha(index, row, stats["total"])
+                    if product is None:
+                        continue
+
+                    sucesso = await self.preencher_produto(page, product)
+                    self._registrar_envio(stats, index, row, product, sucesso, checkpoint)
+                except SalvamentoNaoConfirmado as e:
+                    self._registrar_nao_confirmado(stats, index, row, product, e, checkpoint)
+                except Exception as e:
+                    self._registrar_erro(stats, index, row, e)
+        finally:
+            await page.context.close()
+
+    async def _processar_planilha(self, filepath: str) -> Dict[str, Any]:
+        """Versão assíncrona de processar_planilha."""
+        stats = novas_estatisticas()
+
+        try:
+            stats["total"], rows = ler_linhas(filepath)
+            checkpoint, pendentes = self._retomar(filepath, stats, rows)
+            workers = min(self.workers, len(pendentes)) or 1
+
+            self._report_progress(f"Acessando {self.url}")
+
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=self.headless)
+                try:
+                    self._report_progress(
+                        f"Iniciando processamento de {stats['total']} produtos "
+                        f"com {workers} contextos"
+                    )
+
+                    shared_rows = iter(pendentes)
+                    with checkpoint:
+                        await asyncio.gather(*[
+                            self._worker(browser, shared_rows, stats, checkpoint, worker_id)
+                            for worker_id in range(workers)
+                        ])
+                finally:
+                    await browser.close()
+
+            self._concluir(stats, checkpoint)
+
+        except Exception as e:
+            self._registrar_erro_critico(stats, e)
+
+        return stats
+
+    def processar_planilha(self, filepath: str) -> Dict[str, Any]:
+        """
+        Processa uma planilha Excel preenchendo os produtos em paralelo.
+
+        Args:
+            filepath: Caminho para o arquivo Excel
+
+        Returns:
+            Dicionário com estatísticas do processamento
+        """
+        self._parar = False
+        return asyncio.run(self._processar_planilha(filepath))
+
+    def fechar(self) -> None:
+        """Sinaliza aos workers que parem após o produto em andamento."""
+        self._parar = True
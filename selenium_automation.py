@@ -3,36 +3,92 @@ Módulo de automação Selenium para o Sistema de Contabilidade.
 Responsável por automatizar o preenchimento de dados no site.
 """
 
-import time
+import os
+import shutil
+import tempfile
+import json
+import queue
+import atexit
+import asyncio
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Callable, Optional, List, Dict, Any
-from dataclasses import dataclass
+from typing import Callable, Optional, List, Dict, Any, Iterable, Tuple
+from dataclasses import asdict
 
-import openpyxl
+import aiohttp
 import config
 from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    SessionNotCreatedException,
+    StaleElementReferenceException,
+)
+
+from base_automation import (
+    JS_CONFIRMAR_SALVAMENTO,
+    BaseAutomation,
+    Checkpoint,
+    Product,
+    SalvamentoNaoConfirmado,
+    checar_salvamento,
+    ler_linhas,
+    novas_estatisticas,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Preenche os campos (arguments[0]) com os valores (arguments[1]) usando o
+# setter nativo, dispara input/change para o framework da página e clica no
+# botão salvar (arguments[2]) com JS_CONFIRMAR_SALVAMENTO (seletor de
+# confirmação em arguments[3], limite em arguments[4]). Executado com
+# execute_async_script, conclui com {status, detalhe}: o status de
+# JS_CONFIRMAR_SALVAMENTO, ou "campo_invalido" com o id do campo que recusou
+# o valor (nada foi enviado).
+_JS_PREENCHER_FORM = """
+const campos = arguments[0], valores = arguments[1], botao = arguments[2];
+const confirmacao = arguments[3], limite = arguments[4];
+const done = arguments[arguments.length - 1];
+for (let i = 0; i < campos.length; i++) {
+    const campo = campos[i], valor = String(valores[i]);
+    const setter = Object.getOwnPropertyDescriptor(
+        Object.getPrototypeOf(campo), "value"
+    ).set;
+    setter.call(campo, valor);
+    if (campo.value !== valor) {
+        done({status: "campo_invalido", detalhe: campo.id});
+        return;
+    }
+    campo.dispatchEvent(new Event("input", {bubbles: true}));
+    campo.dispatchEvent(new Event("change", {bubbles: true}));
+}
+const confirmar = """ + JS_CONFIRMAR_SALVAMENTO + """;
+confirmar({botao: botao, primeiro: campos[0], confirmacao: confirmacao, limite: limite})
+    .then(status => done({status: status, detalhe: null}));
+"""
+
 
-@dataclass
-class Product:
-    """Classe para representar um produto."""
-    cliente: str
-    produto: str
-    quantidade: int
-    categoria: str
+def calcular_processos(workers: int, linhas: Optional[int] = None) -> int:
+    """
+    Número de processos Chrome usados por SeleniumAutomation.processar_planilha.
+    
+    Limitado pelos núcleos da máquina, por `workers` e, se informado, pelo
+    número de linhas pendentes. Com 1, não há pool: a própria instância
+    processa as linhas com o seu driver.
+    """
+    processos = min(os.cpu_count() or 1, max(1, workers))
+    if linhas is not None:
+        processos = min(processos, linhas)
+    return processos
 
 
-class SeleniumAutomation:
+class SeleniumAutomation(BaseAutomation):
     """Classe principal para automação de preenchimento de formulários."""
     
     def __init__(
@@ -40,6 +96,8 @@ class SeleniumAutomation:
         url: str = "https://devaprender-contabil.netlify.app/",
     headless: bool = config.HEADLESS_MODE,
         progress_callback: Optional[Callable] = None,
+        workers: int = config.SELENIUM_WORKERS,
+        profile: str = "default",
     ):
         """
         Inicializa a automação Selenium.
@@ -48,211 +106,617 @@ class SeleniumAutomation:
             url: URL do site a automatizar
             headless: Se True, executa o navegador em modo headless
             progress_callback: Função para reportar progresso
+            workers: Máximo de processos paralelos em processar_planilha
+            profile: Subpasta de CHROME_PROFILE_DIR usada como perfil do Chrome
         """
         self.url = url or config.SITE_URL
+        self.headless = headless
         self.progress_callback = progress_callback
+        self.workers = max(1, workers)
+        self.profile = profile
+        self._parar = False
+        self._stop_event = None
         self.driver = None
         self.wait = None
-        self._init_driver(headless)
+        self._campos: Dict[str, Any] = {}
+        self._btn_save = None
+        self._temp_profile: Optional[str] = None
     
-    def _init_driver(self, headless: bool) -> None:
-        """Inicializa o driver do Selenium."""
+    def _chrome_options(self, headless: bool, user_data_dir: Path) -> webdriver.ChromeOptions:
+        """Monta as opções do Chrome para o perfil informado."""
         options = webdriver.ChromeOptions()
         if headless:
             options.add_argument("--headless")
         options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument(f"--user-data-dir={user_data_dir}")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
+        # driver.get retorna quando o DOM está pronto, sem esperar imagens/CSS
+        options.page_load_strategy = "eager"
+        return options
+    
+    def _init_driver(self, headless: bool) -> None:
+        """
+        Inicializa o driver do Selenium.
+        
+        Usa o perfil persistente (cache HTTP, DNS e TLS aquecidos entre
+        execuções); se o Chrome recusar abri-lo (perfil em uso por outro
+        Chrome), recorre a um perfil temporário, apagado em fechar().
+        
+        Não se olha o SingletonLock do perfil: após um crash ele fica para
+        trás e faria toda execução seguinte usar o perfil temporário.
+        """
+        profile_dir = config.CHROME_PROFILE_DIR / self.profile
         
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
+        # O Selenium Manager localiza o chromedriver e o mantém em ~/.cache/selenium
+        try:
+            self.driver = webdriver.Chrome(
+                options=self._chrome_options(headless, profile_dir)
+            )
+        except SessionNotCreatedException as e:
+            logger.warning("Perfil %s indisponível: %s", profile_dir, e)
+        
+        if self.driver is None:
+            self._temp_profile = tempfile.mkdtemp(prefix="automation_chrome_")
+            logger.info("Usando perfil temporário %s", self._temp_profile)
+            self.driver = webdriver.Chrome(
+                options=self._chrome_options(headless, Path(self._temp_profile))
+            )
+        
+        # O script desiste sozinho após ELEMENT_TIMEOUT; a folga cobre o
+        # preenchimento e a ida e volta ao driver
+        self.driver.set_script_timeout(config.ELEMENT_TIMEOUT + 5)
         self.wait = WebDriverWait(self.driver, config.ELEMENT_TIMEOUT)
     
-    def _report_progress(self, message: str, current: int = 0, total: int = 0) -> None:
-        """Reporta progresso via callback."""
-        if self.progress_callback:
-            self.progress_callback(message, current, total)
-        logger.info(f"{message} ({current}/{total})" if total > 0 else message)
-    
     def navigate(self) -> None:
-        """Navega para o URL especificado."""
+        """Navega para o URL especificado, abrindo o Chrome na primeira vez."""
+        if self.driver is None:
+            self._init_driver(self.headless)
         self._report_progress(f"Acessando {self.url}")
         self.driver.get(self.url)
-        time.sleep(2)
+        # Aguarda o formulário em vez de uma pausa fixa
+        self._cachear_elementos()
     
-    def _fill_campo_texto(self, field_id: str, value: str) -> None:
-        """Preenche um campo de texto."""
-        try:
-            element = self.wait.until(
-                EC.presence_of_element_located((By.ID, field_id))
-            )
-            element.clear()
-            element.send_keys(str(value))
-            time.sleep(config.FILL_DELAY)
-        except Exception as e:
-            logger.error(f"Erro ao preencher campo {field_id}: {e}")
-            raise
-    
-    def _select_categoria(self, categoria: str) -> None:
-        """Seleciona uma categoria no dropdown."""
-        try:
-            select_element = self.wait.until(
-                EC.presence_of_element_located((By.ID, "categoria"))
-            )
-            select = Select(select_element)
-            select.select_by_value(categoria)
-            time.sleep(config.FILL_DELAY)
-        except Exception as e:
-            logger.error(f"Erro ao selecionar categoria {categoria}: {e}")
-            raise
+    def _cachear_elementos(self) -> None:
+        """Guarda as referências dos campos e do botão salvar do formulário."""
+        self.wait.until(
+            EC.presence_of_element_located((By.ID, config.FORM_FIELDS["cliente"]))
+        )
+        self._campos = {
+            campo: self.driver.find_element(By.ID, field_id)
+            for campo, field_id in config.FORM_FIELDS.items()
+        }
+        self._btn_save = self.driver.find_element(By.CSS_SELECTOR, config.BUTTONS["save"])
     
-    def _submit_form(self) -> None:
-        """Submete o formulário."""
-        try:
-            btn_save = self.wait.until(
-                EC.element_to_be_clickable(
-                    (By.CSS_SELECTOR, config.BUTTONS["save"])
-                )
-            )
-            btn_save.click()
-            time.sleep(config.SUBMIT_DELAY)
-        except Exception as e:
-            logger.error(f"Erro ao submeter formulário: {e}")
-            raise
+    def _preencher_via_js(self, product: Product) -> None:
+        """
+        Preenche todos os campos, clica em salvar e aguarda a confirmação do
+        salvamento numa única chamada.
+        
+        Raises:
+            ValueError: Se algum campo recusar o valor
+            RuntimeError: Se a requisição de salvamento falhar
+            SalvamentoNaoConfirmado: Se o site não confirmar o salvamento a tempo
+        """
+        resultado = self.driver.execute_async_script(
+            _JS_PREENCHER_FORM,
+            list(self._campos.values()),
+            [getattr(product, campo) for campo in self._campos],
+            self._btn_save,
+            config.SAVE_CONFIRMATION_SELECTOR,
+            config.ELEMENT_TIMEOUT * 1000,
+        )
+        if resultado["status"] == "campo_invalido":
+            raise ValueError(f"Valor não aceito pelo campo {resultado['detalhe']}")
+        checar_salvamento(resultado["status"])
     
-    def _limpar_form(self) -> None:
-        """Limpa o formulário."""
-        try:
-            btn_clear = self.driver.find_element(By.CSS_SELECTOR, config.BUTTONS["clear"])
-            btn_clear.click()
-            time.sleep(config.ACTION_DELAY)
-        except Exception as e:
-            logger.warning(f"Erro ao limpar formulário: {e}")
+    def _enviar_via_fetch(self, product: Product) -> None:
+        """
+        Envia o produto com um fetch executado na própria página via CDP.
+        
+        Dispensa o preenchimento do formulário e mantém os cookies da sessão.
+        """
+        expression = (
+            f"fetch({json.dumps(config.API_URL)}, {{"
+            f"method: 'POST', credentials: 'include', "
+            f"headers: {{'Content-Type': 'application/json'}}, "
+            f"body: {json.dumps(json.dumps(asdict(product)))}"
+            f"}}).then(response => response.status)"
+        )
+        result = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True,
+        })
+        if "exceptionDetails" in result:
+            raise RuntimeError(result["exceptionDetails"].get("text", "Falha no fetch"))
+        
+        status = result["result"]["value"]
+        if not 200 <= status < 300:
+            raise RuntimeError(f"Resposta HTTP {status}")
     
     def preencher_produto(self, product: Product) -> bool:
         """
         Preenche e submete um produto.
         
+        Com config.API_URL definido, o produto é enviado por fetch dentro da
+        página; caso contrário, o formulário é preenchido via JavaScript.
+        
         Args:
             product: Objeto Product com dados a preencher
             
         Returns:
             True se sucesso, False caso contrário
+            
+        Raises:
+            SalvamentoNaoConfirmado: Se o produto foi enviado sem confirmação
         """
         try:
-            self._limpar_form()
-            self._fill_campo_texto("cliente", product.cliente)
-            self._fill_campo_texto("produto", product.produto)
-            self._fill_campo_texto("quantidade", product.quantidade)
-            self._select_categoria(product.categoria)
-            self._submit_form()
+            if config.API_URL:
+                self._enviar_via_fetch(product)
+                return True
+            
+            # Todos os campos são sobrescritos; não é preciso limpar antes
+            try:
+                self._preencher_via_js(product)
+            except StaleElementReferenceException:
+                # A página recriou o formulário: renova as referências
+                self._cachear_elementos()
+                self._preencher_via_js(product)
             return True
+        except SalvamentoNaoConfirmado:
+            raise
         except Exception as e:
-            logger.error(f"Erro ao preencher produto {product.produto}: {e}")
+            logger.error("Erro ao preencher produto %s: %s", product.produto, e)
             return False
     
+    def _processar_linhas(
+        self,
+        rows: Iterable[Tuple[int, tuple]],
+        total: int,
+        checkpoint: Optional[Checkpoint] = None
+    ) -> Dict[str, Any]:
+        """
+        Preenche os produtos de um conjunto de linhas já numeradas.
+        
+        Args:
+            rows: Pares (índice, linha) a processar
+            total: Total de linhas da planilha, usado no progresso
+            checkpoint: Onde registrar cada linha enviada com sucesso
+            
+        Returns:
+            Dicionário com estatísticas das linhas processadas
+        """
+        stats = novas_estatisticas()
+        
+        for index, row in rows:
+            if self._parar:
+                break
+            if self._stop_event is not None and self._stop_event.is_set():
+                break
+            
+            try:
+                product = self._preparar_linha(index, row, total)
+                if product is None:
+                    continue
+                
+                sucesso = self.preencher_produto(product)
+                self._registrar_envio(stats, index, row, product, sucesso, checkpoint)
+            except SalvamentoNaoConfirmado as e:
+                self._registrar_nao_confirmado(stats, index, row, product, e, checkpoint)
+            except Exception as e:
+                self._registrar_erro(stats, index, row, e)
+        
+        return stats
+    
+    def _processar_em_paralelo(
+        self,
+        rows: List[Tuple[int, tuple]],
+        total: int,
+        workers: int,
+        filepath: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Divide as linhas entre processos, cada um com seu próprio Chrome.
+        
+        O progresso dos processos chega por uma fila e é repassado ao
+        progress_callback por uma thread local; os registros de log chegam
+        por outra fila e seguem para os handlers deste processo (arquivo de
+        log incluído). Cada processo registra suas
+        linhas concluídas no checkpoint de `filepath`. `total` é o total de
+        linhas da planilha, usado no progresso.
+        """
+        # Distribuição intercalada: os índices reportados crescem juntos
+        chunks = [rows[i::workers] for i in range(workers)]
+        
+        with multiprocessing.Manager() as manager:
+            progress_queue = manager.Queue()
+            log_queue = manager.Queue()
+            self._stop_event = manager.Event()
+            
+            # O processo já registrou a mensagem no log; aqui só a interface
+            def drenar_progresso() -> None:
+                for message, current, count in iter(progress_queue.get, None):
+                    if self.progress_callback:
+                        self.progress_callback(message, current, count)
+            
+            drainer = threading.Thread(target=drenar_progresso, daemon=True)
+            drainer.start()
+            log_listener = QueueListener(log_queue, _RegistroDoWorker())
+            log_listener.start()
+            
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_configurar_log_worker,
+                    initargs=(log_queue,),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _worker_process,
+                            chunk,
+                            total,
+                            self.url,
+                            self.headless,
+                            progress_queue,
+                            self._stop_event,
+                            f"worker-{worker_id}",
+                            filepath,
+                        )
+                        for worker_id, chunk in enumerate(chunks)
+                    ]
+                    
+                    # Um processo que falha não descarta o resultado dos demais
+                    parciais = []
+                    for worker_id, future in enumerate(futures):
+                        try:
+                            parciais.append(future.result())
+                        except Exception as e:
+                            parcial = novas_estatisticas()
+                            self._registrar_falha_worker(parcial, f"worker-{worker_id}", e)
+                            parciais.append(parcial)
+                    return parciais
+            finally:
+                progress_queue.put(None)
+                drainer.join()
+                log_listener.stop()
+                self._stop_event = None
+    
     def processar_planilha(self, filepath: str) -> Dict[str, Any]:
         """
         Processa uma planilha Excel e preenche todos os produtos.
         
+        Com mais de um worker, as linhas são divididas entre processos
+        independentes do Selenium.
+        
         Args:
             filepath: Caminho para o arquivo Excel
             
         Returns:
             Dicionário com estatísticas do processamento
         """
-        stats = {
-            "total": 0,
-            "sucesso": 0,
-            "erro": 0,
-            "erros_detalhados": []
-        }
+        stats = novas_estatisticas()
+        self._parar = False
         
         try:
-            self.navigate()
+            stats["total"], rows = ler_linhas(filepath)
             
-            workbook = openpyxl.load_workbook(filepath)
-            ws = workbook.active
+            self._report_progress(f"Iniciando processamento de {stats['total']} produtos")
             
-            # Pula o cabeçalho
-            rows = list(ws.iter_rows(values_only=True))[1:]
-            stats["total"] = len(rows)
+            checkpoint, pendentes = self._retomar(filepath, stats, rows)
+            # Numa retomada, só as linhas pendentes justificam abrir processos
+            workers = calcular_processos(self.workers, len(pendentes))
             
-            self._report_progress(f"Iniciando processamento de {stats['total']} produtos")
+            parciais = []
+            if workers > 1:
+                self._report_progress(f"Distribuindo entre {workers} processos")
+                parciais = self._processar_em_paralelo(
+                    pendentes, stats["total"], workers, filepath
+                )
+            elif pendentes:
+                self.navigate()
+                with checkpoint:
+                    parciais = [
+                        self._processar_linhas(pendentes, stats["total"], checkpoint)
+                    ]
             
-            for index, row in enumerate(rows, 1):
-                if not row or not row[0]:  # Pula linhas vazias
-                    continue
-                
-                try:
-                    cliente, produto, quantidade, categoria = row[:4]
-                    
-                    # Validação básica
-                    if not all([cliente, produto, quantidade, categoria]):
-                        raise ValueError("Campos obrigatórios vazios")
-                    
-                    product = Product(
-                        cliente=str(cliente).strip(),
-                        produto=str(produto).strip(),
-                        quantidade=int(quantidade),
-                        categoria=str(categoria).strip()
-                    )
-                    
-                    self._report_progress(
-                        f"Processando: {product.cliente} - {product.produto}",
-                        index,
-                        stats["total"]
-                    )
-                    
-                    if self.preencher_produto(product):
-                        stats["sucesso"] += 1
-                    else:
-                        stats["erro"] += 1
-                        stats["erros_detalhados"].append({
-                            "linha": index + 1,
-                            "produto": produto,
-                            "erro": "Falha ao submeter"
-                        })
-                
-                except Exception as e:
-                    stats["erro"] += 1
-                    stats["erros_detalhados"].append({
-                        "linha": index + 1,
-                        "produto": row[1] if len(row) > 1 else "Desconhecido",
-                        "erro": str(e)
-                    })
-                    logger.error(f"Erro na linha {index + 1}: {e}")
+            for parcial in parciais:
+                stats["sucesso"] += parcial["sucesso"]
+                stats["erro"] += parcial["erro"]
+                stats["nao_confirmado"] += parcial["nao_confirmado"]
+                stats["erros_detalhados"].extend(parcial["erros_detalhados"])
+                stats["nao_confirmados_detalhados"].extend(
+                    parcial["nao_confirmados_detalhados"]
+                )
             
-            self._report_progress(
-                f"Processamento concluído: {stats['sucesso']} sucesso, {stats['erro']} erros"
-            )
+            self._concluir(stats, checkpoint)
             
         except Exception as e:
-            logger.error(f"Erro crítico ao processar planilha: {e}")
-            stats["erros_detalhados"].append({
-                "linha": 0,
-                "produto": "ERRO CRÍTICO",
-                "erro": str(e)
-            })
+            self._registrar_erro_critico(stats, e)
         
         return stats
     
     def fechar(self) -> None:
-        """Fecha o driver do Selenium."""
+        """Fecha o driver do Selenium e sinaliza a parada dos processos."""
+        self._parar = True
+        if self._stop_event is not None:
+            self._stop_event.set()
         if self.driver:
             self.driver.quit()
+            self.driver = None
+        if self._temp_profile is not None:
+            shutil.rmtree(self._temp_profile, ignore_errors=True)
+            self._temp_profile = None
+
+
+class HttpAutomation(BaseAutomation):
+    """
+    Envia os produtos diretamente ao endpoint de salvamento do site.
+    
+    Dispensa o navegador: cada produto vira um POST JSON, com até
+    `concurrency` requisições simultâneas.
+    """
+    
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        progress_callback: Optional[Callable] = None,
+        concurrency: int = config.HTTP_CONCURRENCY,
+    ):
+        """
+        Inicializa a automação HTTP.
+        
+        Args:
+            api_url: Endpoint que recebe o POST (padrão: config.API_URL)
+            progress_callback: Função para reportar progresso
+            concurrency: Máximo de requisições simultâneas
+            
+        Raises:
+            ValueError: Se nenhum endpoint estiver configurado
+        """
+        api_url = api_url or config.API_URL
+        if not api_url:
+            raise ValueError("API_URL não configurada em config.py")
+        
+        self.api_url = api_url
+        self.progress_callback = progress_callback
+        self.concurrency = max(1, concurrency)
+        self._parar = False
+    
+    async def preencher_produto(
+        self,
+        session: aiohttp.ClientSession,
+        product: Product
+    ) -> bool:
+        """
+        Envia um produto ao endpoint.
+        
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        try:
+            async with session.post(self.api_url, json=asdict(product)) as response:
+                response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.error("Erro ao enviar produto %s: %s", product.produto, e)
+            return False
+    
+    async def _processar_linha(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        index: int,
+        row: tuple,
+        stats: Dict[str, Any],
+        checkpoint: Checkpoint
+    ) -> None:
+        """Valida e envia uma linha, respeitando o limite de concorrência."""
+        async with semaphore:
+            if self._parar:
+                return
+            
+            try:
+                product = self._preparar_linha(index, row, stats["total"])
+                if product is None:
+                    return
+                
+                sucesso = await self.preencher_produto(session, product)
+                self._registrar_envio(stats, index, row, product, sucesso, checkpoint)
+            except Exception as e:
+                self._registrar_erro(stats, index, row, e)
+    
+    async def _processar_planilha(self, filepath: str) -> Dict[str, Any]:
+        """Versão assíncrona de processar_planilha."""
+        stats = novas_estatisticas()
+        
+        try:
+            stats["total"], rows = ler_linhas(filepath)
+            
+            self._report_progress(f"Iniciando envio de {stats['total']} produtos para {self.api_url}")
+            
+            checkpoint, pendentes = self._retomar(filepath, stats, rows)
+            
+            semaphore = asyncio.Semaphore(self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT)
+            with checkpoint:
+                async with aiohttp.ClientSession(timeout=timeout) as session:
+                    await asyncio.gather(*[
+                        self._processar_linha(session, semaphore, index, row, stats, checkpoint)
+                        for index, row in pendentes
+                    ])
+            
+            self._concluir(stats, checkpoint)
+        
+        except Exception as e:
+            self._registrar_erro_critico(stats, e)
+        
+        return stats
+    
+    def processar_planilha(self, filepath: str) -> Dict[str, Any]:
+        """
+        Processa uma planilha Excel enviando os produtos por HTTP.
+        
+        Args:
+            filepath: Caminho para o arquivo Excel
+            
+        Returns:
+            Dicionário com estatísticas do processamento
+        """
+        self._parar = False
+        return asyncio.run(self._processar_planilha(filepath))
+    
+    def fechar(self) -> None:
+        """Interrompe o envio dos produtos ainda não iniciados."""
+        self._parar = True
+
+
+class _RegistroDoWorker(logging.Handler):
+    """Entrega os registros vindos dos processos do pool aos loggers locais."""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+
+def _configurar_log_worker(log_queue: Any) -> None:
+    """
+    Inicializador dos processos do pool: troca os handlers herdados (ou a
+    falta deles, no spawn do Windows) por um QueueHandler que envia os
+    registros ao processo principal.
+    """
+    raiz = logging.getLogger()
+    for handler in raiz.handlers[:]:
+        raiz.removeHandler(handler)
+    raiz.addHandler(QueueHandler(log_queue))
+    raiz.setLevel(logging.INFO)
+
+
+def _worker_process(
+    rows_chunk: List[Tuple[int, tuple]],
+    total: int,
+    url: str,
+    headless: bool,
+    progress_queue: Any = None,
+    stop_event: Any = None,
+    profile: str = "default",
+    filepath: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Processa um lote de linhas em um processo com seu próprio Chrome.
     
-    def __enter__(self):
-        """Context manager entry."""
-        return self
+    Executado pelo ProcessPoolExecutor; o progresso é enviado pela fila
+    como tuplas (mensagem, atual, total). Cada processo precisa de um
+    `profile` próprio, pois o Chrome bloqueia o perfil em uso. Com
+    `filepath`, as linhas concluídas são registradas no checkpoint da planilha.
+    """
+    progress_callback = None
+    if progress_queue is not None:
+        def progress_callback(message: str, current: int = 0, count: int = 0) -> None:
+            progress_queue.put((message, current, count))
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
-        self.fechar()
+    with SeleniumAutomation(
+        url=url,
+        headless=headless,
+        progress_callback=progress_callback,
+        workers=1,
+        profile=profile,
+    ) as automation:
+        automation._stop_event = stop_event
+        automation.navigate()
+        if filepath is None:
+            return automation._processar_linhas(rows_chunk, total)
+        with Checkpoint(filepath) as checkpoint:
+            return automation._processar_linhas(rows_chunk, total, checkpoint)
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler que escreve em buffer e só descarrega no disco a cada
+    `flush_every` registros ou, por uma thread própria, a cada
+    `flush_interval` segundos.
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        buffer_size: int = 64 * 1024,
+        flush_every: int = 50,
+        flush_interval: float = 0.1,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._pending = 0
+        super().__init__(filename, delay=True)
+        
+        # Descarrega periodicamente mesmo sem novos registros
+        self._flush_stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodicamente, daemon=True)
+        self._flusher.start()
+    
+    def _flush_periodicamente(self) -> None:
+        """Descarrega o buffer a cada `flush_interval` enquanto houver pendências."""
+        while not self._flush_stop.wait(self.flush_interval):
+            with self.lock:
+                if self._pending and self.stream is not None:
+                    self.stream.flush()
+                    self._pending = 0
+    
+    def _open(self):
+        """Abre o arquivo com um buffer de escrita maior que o padrão."""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Escreve o registro sem forçar flush a cada chamada."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            
+            if self._pending >= self.flush_every:
+                self.flush()
+                self._pending = 0
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        """Para a thread de flush e fecha o arquivo, descarregando o buffer."""
+        self._flush_stop.set()
+        super().close()
+
+
+_log_listener: Optional[QueueListener] = None
+_log_queue_handler: Optional[QueueHandler] = None
+
+
+def _stop_log_listener() -> None:
+    """Remove o QueueHandler e para o listener, fechando o arquivo de log."""
+    global _log_listener, _log_queue_handler
+    if _log_queue_handler is not None:
+        logging.getLogger().removeHandler(_log_queue_handler)
+        _log_queue_handler = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
 
 
 def setup_logging(log_file: Optional[str] = None) -> None:
-    """Configura o logging da aplicação."""
+    """
+    Configura o logging da aplicação.
+    
+    O arquivo de log é escrito por uma thread própria (QueueListener), de
+    modo que as chamadas de log no laço de processamento não bloqueiam em I/O.
+    """
+    global _log_listener, _log_queue_handler
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     logging.basicConfig(
@@ -261,6 +725,16 @@ def setup_logging(log_file: Optional[str] = None) -> None:
     )
     
     if log_file:
-        file_handler = logging.FileHandler(log_file)
+        _stop_log_listener()
+        
+        file_handler = _BufferedFileHandler(log_file)
         file_handler.setFormatter(logging.Formatter(log_format))
-        logger.addHandler(file_handler)
+        
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        _log_queue_handler = QueueHandler(log_queue)
+        # No logger raiz: recebe também base_automation e playwright_automation
+        logging.getLogger().addHandler(_log_queue_handler)
+        _log_listener = QueueListener(log_queue, file_handler)
+        _log_listener.start()
+        atexit.unregister(_stop_log_listener)
+        atexit.register(_stop_log_listener)
@@ -0,0 +1,180 @@
+"""
+Testes da leitura da planilha, da validação das linhas e do checkpoint
+que evita reenviar produtos ao retomar.
+
+Executar a partir da raiz do projeto: python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from base_automation import (
+    BaseAutomation,
+    Checkpoint,
+    criar_produto,
+    ler_linhas,
+    novas_estatisticas,
+)
+
+
+LINHAS = [
+    ("Ana Costa", "Livro", 2, "Livros"),
+    ("Bruno Gomes", "Bola Futebol", 1, "Esportes"),
+    ("Carlos Souza", "Cadeira Gamer", 3, "Móveis"),
+]
+
+
+class _Automacao(BaseAutomation):
+    """Backend mínimo para exercitar os helpers de BaseAutomation."""
+
+    def processar_planilha(self, filepath):
+        raise NotImplementedError
+
+    def fechar(self):
+        self._parar = True
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.planilha = str(Path(self._dir.name) / "dados.xlsx")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _marcar(self, *indices, linhas=LINHAS):
+        checkpoint = Checkpoint(self.planilha)
+        checkpoint.preparar(len(linhas))
+        with checkpoint:
+            for index in indices:
+                checkpoint.marcar(index, linhas[index - 1])
+
+    def test_retomada_pula_linhas_ja_enviadas(self):
+        self._marcar(1, 3)
+
+        checkpoint = Checkpoint(self.planilha)
+        checkpoint.preparar(len(LINHAS))
+
+        self.assertEqual(list(checkpoint.pendentes(LINHAS)), [(2, LINHAS[1])])
+
+    def test_linha_alterada_volta_a_ser_enviada(self):
+        self._marcar(1, 2)
+        linhas = [LINHAS[0], ("Bruno Gomes", "Bola Futebol", 5, "Esportes"), LINHAS[2]]
+
+        checkpoint = Checkpoint(self.planilha)
+        checkpoint.preparar(len(linhas))
+
+        self.assertEqual(
+            [index for index, _ in checkpoint.pendentes(linhas)],
+            [2, 3]
+        )
+
+    def test_linhas_iguais_em_posicoes_diferentes_sao_distintas(self):
+        linhas = [LINHAS[0], LINHAS[0]]
+        self._marcar(1, linhas=linhas)
+
+        checkpoint = Checkpoint(self.planilha)
+        checkpoint.preparar(len(linhas))
+
+        self.assertEqual([index for index, _ in checkpoint.pendentes(linhas)], [2])
+
+    def test_preparar_descarta_indices_fora_da_planilha(self):
+        self._marcar(1, 3)
+
+        checkpoint = Checkpoint(self.planilha)
+        checkpoint.preparar(2)
+
+        self.assertEqual(checkpoint.concluidas, {(1, Checkpoint.chave(LINHAS[0]))})
+
+    def test_preparar_sem_nada_a_retomar_recomeca_o_arquivo(self):
+        self._marcar(3)
+
+        Checkpoint(self.planilha).preparar(2)
+
+        self.assertEqual(Checkpoint(self.planilha).concluidas, set())
+
+    def test_registros_corrompidos_sao_ignorados(self):
+        chave = Checkpoint.chave(LINHAS[0])
+        Path(self.planilha).with_suffix(".ckpt").write_text(
+            f"1 {chave}\n2\nlixo\n3 {chave} extra\n", encoding="utf-8"
+        )
+
+        self.assertEqual(Checkpoint(self.planilha).concluidas, {(1, chave)})
+
+    def test_retomar_conta_como_sucesso_so_linhas_que_casam(self):
+        self._marcar(1, 2, 3)
+        linhas = [LINHAS[0], ("Bruno Gomes", "Bola Futebol", 5, "Esportes")]
+        stats = novas_estatisticas()
+        stats["total"] = len(linhas)
+
+        _, pendentes = _Automacao()._retomar(self.planilha, stats, linhas)
+
+        self.assertEqual(stats["sucesso"], 1)
+        self.assertEqual(pendentes, [(2, linhas[1])])
+
+
+class CriarProdutoTest(unittest.TestCase):
+
+    def test_linha_valida(self):
+        product = criar_produto(("Ana Costa", "Livro", 2.0, "Livros"))
+
+        self.assertEqual(product.quantidade, 2)
+        self.assertIsInstance(product.quantidade, int)
+
+    def test_quantidade_vazia(self):
+        with self.assertRaisesRegex(ValueError, "^Campos obrigatórios vazios$"):
+            criar_produto(("Ana Costa", "Livro", None, "Livros"))
+
+    def test_quantidade_invalida(self):
+        with self.assertRaisesRegex(ValueError, "^Quantidade inválida: dez$"):
+            criar_produto(("Ana Costa", "Livro", "dez", "Livros"))
+
+    def test_categoria_invalida(self):
+        with self.assertRaisesRegex(ValueError, "^Categoria inválida: Carros$"):
+            criar_produto(("Ana Costa", "Livro", 1, "Carros"))
+
+
+class LerLinhasTest(unittest.TestCase):
+
+    def _ler(self, linhas):
+        df = pd.DataFrame(linhas, columns=["cliente", "produto", "quantidade", "categoria"])
+        with mock.patch("base_automation.pd.read_excel", return_value=df.astype(object)):
+            total, rows = ler_linhas("dados.xlsx")
+        return total, list(rows)
+
+    def test_normaliza_textos_e_quantidade(self):
+        total, rows = self._ler([["  Ana Costa ", " Livro", "2", "Livros  "]])
+
+        self.assertEqual(total, 1)
+        self.assertEqual(rows, [("Ana Costa", "Livro", 2, "Livros")])
+
+    def test_celulas_vazias_viram_none(self):
+        _, rows = self._ler([[None, None, None, None]])
+
+        self.assertEqual(rows, [(None, None, None, None)])
+
+    def test_quantidade_nao_numerica_e_mantida_para_o_erro(self):
+        _, rows = self._ler([["Ana Costa", "Livro", "dez", "Livros"]])
+
+        with self.assertRaisesRegex(ValueError, "^Quantidade inválida: dez$"):
+            criar_produto(rows[0])
+
+    def test_linha_vazia_e_pulada(self):
+        _, rows = self._ler([[None, None, None, None]])
+
+        self.assertIsNone(_Automacao()._preparar_linha(1, rows[0], 1))
+
+    def test_cliente_so_com_espacos_e_reportado(self):
+        _, rows = self._ler([["   ", "Livro", 2, "Livros"]])
+
+        with self.assertRaisesRegex(ValueError, "^Campos obrigatórios vazios$"):
+            _Automacao()._preparar_linha(1, rows[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()